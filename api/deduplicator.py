@@ -59,7 +59,22 @@ def get_opportunity_model():
     from api.index import Opportunity
     return Opportunity
 
-def deduplicate_opportunity(opportunity_dict: Dict, db=None, Opportunity=None) -> Tuple[Optional[object], bool]:
+def load_source_index(db, Opportunity, source: str) -> Dict[str, int]:
+    """
+    Map source_id -> opportunity ID for every active opportunity from one source.
+    
+    Lets a fetch run answer the source + source_id duplicate check from memory
+    with one SELECT per source, instead of one SELECT per fetched opportunity.
+    """
+    rows = db.session.query(Opportunity.source_id, Opportunity.id).filter(
+        Opportunity.source == source,
+        Opportunity.source_id.isnot(None),
+        Opportunity.is_deleted == False
+    ).all()
+    return {source_id: opp_id for source_id, opp_id in rows}
+
+def deduplicate_opportunity(opportunity_dict: Dict, db=None, Opportunity=None,
+                            source_indexes: Optional[Dict[str, Dict[str, int]]] = None) -> Tuple[Optional[object], bool]:
     """
     Check if opportunity already exists and return existing or None.
     
@@ -67,6 +82,7 @@ def deduplicate_opportunity(opportunity_dict: Dict, db=None, Opportunity=None) -
         opportunity_dict: Dictionary with opportunity data including source and source_id
         db: SQLAlchemy database instance (ignored - always retrieved from Flask app context)
         Opportunity: Opportunity model class (ignored - always retrieved from Flask app context)
+        source_indexes: Optional per-run cache of load_source_index() results keyed by source
     
     Returns:
         Tuple of (existing_opportunity_or_None, is_duplicate)
@@ -98,11 +114,17 @@ def deduplicate_opportunity(opportunity_dict: Dict, db=None, Opportunity=None) -
         
         for attempt in range(max_retries):
             try:
-                existing = db.session.query(Opportunity).filter_by(
-                    source=source,
-                    source_id=source_id,
-                    is_deleted=False
-                ).first()
+                if source_indexes is not None:
+                    if source not in source_indexes:
+                        source_indexes[source] = load_source_index(db, Opportunity, source)
+                    existing_id = source_indexes[source].get(source_id)
+                    existing = db.session.get(Opportunity, existing_id) if existing_id else None
+                else:
+                    existing = db.session.query(Opportunity).filter_by(
+                        source=source,
+                        source_id=source_id,
+                        is_deleted=False
+                    ).first()
                 
                 # Release connection immediately after query
                 db.session.close()
@@ -144,7 +166,7 @@ def deduplicate_opportunity(opportunity_dict: Dict, db=None, Opportunity=None) -
                     Opportunity.title.ilike(f'%{title}%'),
                     Opportunity.company.ilike(f'%{company}%'),
                     Opportunity.type == opp_type,
-                    (Opportunity.is_deleted == False) | (Opportunity.is_deleted.is_(None))
+                    Opportunity.is_deleted == False
                 ).first()
                 
                 # Release connection immediately after query
@@ -219,7 +241,8 @@ def titles_similar(title1: str, title2: str, threshold: float = 0.85) -> bool:
         return False
 
 
-def save_or_update_opportunity(opportunity_dict: Dict, db=None, Opportunity=None) -> Tuple:
+def save_or_update_opportunity(opportunity_dict: Dict, db=None, Opportunity=None,
+                               source_indexes: Optional[Dict[str, Dict[str, int]]] = None) -> Tuple:
     """
     Save opportunity or update existing one if duplicate found.
     
@@ -227,6 +250,7 @@ def save_or_update_opportunity(opportunity_dict: Dict, db=None, Opportunity=None
         opportunity_dict: Dictionary with opportunity data
         db: SQLAlchemy database instance (optional, will be retrieved if not provided)
         Opportunity: Opportunity model class (optional, will be retrieved if not provided)
+        source_indexes: Optional per-run source_id cache shared across calls (see load_source_index)
     
     Returns:
         Tuple of (opportunity_object, is_new)
@@ -252,7 +276,9 @@ def save_or_update_opportunity(opportunity_dict: Dict, db=None, Opportunity=None
     # #endregion
     
     try:
-        existing, is_duplicate = deduplicate_opportunity(opportunity_dict, db=db, Opportunity=Opportunity)
+        existing, is_duplicate = deduplicate_opportunity(
+            opportunity_dict, db=db, Opportunity=Opportunity, source_indexes=source_indexes
+        )
     except Exception as dedup_err:
         # #region agent log
         import traceback
@@ -508,6 +534,10 @@ def save_or_update_opportunity(opportunity_dict: Dict, db=None, Opportunity=None
         try:
             db.session.commit()
             print(f"SUCCESS: Created new opportunity ID {new_opp.id if new_opp else 'None'}")
+            # Keep the run's index current so a repeat of this item later in the feed is found
+            source = opportunity_dict.get('source')
+            if source_indexes is not None and source in source_indexes and new_opp.source_id:
+                source_indexes[source][new_opp.source_id] = new_opp.id
             # Release connection immediately after commit
             db.session.close()
         except Exception as db_err:
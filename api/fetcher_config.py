@@ -48,6 +48,9 @@ class FetcherConfig:
     # Rate limiting
     RATE_LIMIT_PER_SOURCE = int(os.environ.get('RATE_LIMIT_PER_SOURCE', '100'))
     
+    # Worker threads used to parse entries of a single feed (1 = sequential)
+    PARSE_CONCURRENCY = max(1, int(os.environ.get('PARSE_CONCURRENCY', '4')))
+    
     @classmethod
     def get_enabled_fetchers(cls) -> List[str]:
         """Get list of enabled fetcher names"""
@@ -4,12 +4,41 @@ Fetches from GitHub Jobs, Stack Overflow Jobs, Eventbrite, and other RSS feeds.
 """
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from api.opportunity_fetchers import OpportunityFetcher
+from api.fetcher_config import FetcherConfig
 import json
 import os
 
+# Shared HTTP session: keeps connections alive across feeds and retries transient failures.
+# Use a realistic browser user agent to avoid 403 errors
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Referer': 'https://www.google.com/'
+})
+_retry_adapter = HTTPAdapter(max_retries=Retry(
+    total=2,
+    connect=2,
+    read=1,
+    backoff_factor=0.5,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=['GET', 'HEAD']
+))
+_SESSION.mount('http://', _retry_adapter)
+_SESSION.mount('https://', _retry_adapter)
+
+# (connect, read) - fail fast on dead hosts instead of holding a worker for 30s
+FEED_TIMEOUT = (3.05, 10)
+
 class RSSFetcher(OpportunityFetcher):
     """Fetcher for RSS/Atom feeds"""
     
@@ -19,6 +48,28 @@ class RSSFetcher(OpportunityFetcher):
     
     def fetch(self) -> List[Dict]:
         """Fetch opportunities from RSS feed"""
+        return list(self.iter_fetch())
+    
+    def iter_fetch(self) -> Iterator[Dict]:
+        """Yield normalized opportunities from the RSS feed as entries are parsed"""
+        self.fetch_count = 0
+        for opp in self.parse_entries(self.fetch_entries()):
+            if opp:
+                self.fetch_count += 1
+                yield self.normalize(opp)
+        print(f"Successfully fetched {self.fetch_count} opportunities from {self.source_name}")
+    
+    def parse_entries(self, entries: List) -> Iterator[Optional[Dict]]:
+        """Parse feed entries in order; entries are independent, so use a small thread pool"""
+        workers = min(FetcherConfig.PARSE_CONCURRENCY, len(entries))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(self.parse_entry_safe, entries)
+        else:
+            yield from map(self.parse_entry_safe, entries)
+    
+    def fetch_entries(self) -> List:
+        """Download and parse the feed, returning its raw entries ([] on error)"""
         try:
             # #region agent log
             log_path = os.path.join(os.path.dirname(__file__), '..', 'fetch_debug.log')
@@ -36,17 +87,6 @@ class RSSFetcher(OpportunityFetcher):
             except: pass
             # #endregion
             
-            # Fetch RSS feed using requests (better error handling and SSL support)
-            # Use a realistic browser user agent to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/rss+xml, application/xml, text/xml, */*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Referer': 'https://www.google.com/'
-            }
-            
             # #region agent log
             try:
                 with open(log_path, 'a') as f:
@@ -62,8 +102,8 @@ class RSSFetcher(OpportunityFetcher):
             except: pass
             # #endregion
             
-            # Use requests to fetch the feed content
-            response = requests.get(self.feed_url, headers=headers, timeout=30, verify=True, allow_redirects=True)
+            # Fetch the feed content on the shared session (retries transient errors)
+            response = _SESSION.get(self.feed_url, timeout=FEED_TIMEOUT, allow_redirects=True)
             
             # #region agent log
             try:
@@ -122,19 +162,11 @@ class RSSFetcher(OpportunityFetcher):
             if feed.bozo:
                 print(f"Warning: RSS feed parsing issues for {self.feed_url}: {feed.bozo_exception}")
             
-            opportunities = []
-            for entry in feed.entries:
-                try:
-                    opp = self.parse_entry(entry)
-                    if opp:
-                        opportunities.append(self.normalize(opp))
-                except Exception as e:
-                    print(f"Error parsing RSS entry: {e}")
-                    continue
-            
-            self.fetch_count = len(opportunities)
-            print(f"Successfully fetched {len(opportunities)} opportunities from {self.source_name}")
-            return opportunities
+            return feed.entries
+        except requests.exceptions.RetryError as e:
+            print(f"Warning: giving up on RSS feed {self.feed_url} after retries: {e}")
+            self.error_count += 1
+            return []
         except requests.exceptions.RequestException as e:
             # #region agent log
             try:
@@ -174,6 +206,14 @@ class RSSFetcher(OpportunityFetcher):
             self.error_count += 1
             return []
     
+    def parse_entry_safe(self, entry: Dict) -> Optional[Dict]:
+        """Parse a single RSS entry, returning None instead of raising"""
+        try:
+            return self.parse_entry(entry)
+        except Exception as e:
+            print(f"Error parsing RSS entry: {e}")
+            return None
+    
     def parse_entry(self, entry: Dict) -> Optional[Dict]:
         """Parse a single RSS entry with optional AI filtering"""
         # Extract basic info
@@ -211,7 +251,7 @@ class RSSFetcher(OpportunityFetcher):
             deadline = self.parse_date(date_str)
         
         # Generate source_id from link or title
-        source_id = link.split('/')[-1] if link else title.lower().replace(' ', '-')
+        source_id = link.rpartition('/')[2] if link else title.lower().replace(' ', '-')
         
         return {
             'title': title,
@@ -312,18 +352,6 @@ class StackOverflowJobsFetcher(RSSFetcher):
         )
 
 
-class EventbriteFetcher(RSSFetcher):
-    """Fetcher for Eventbrite RSS feeds"""
-    
-    def __init__(self, feed_url: str = None):
-        # Eventbrite category feeds (example - can be customized)
-        default_url = 'https://www.eventbrite.com/rss'
-        super().__init__(
-            feed_url=feed_url or default_url,
-            source_name='eventbrite'
-        )
-
-
 class RedditJobsFetcher(RSSFetcher):
     """Fetcher for Reddit job board RSS feeds. Filtering is done in the scheduler via Ollama."""
     
@@ -4,28 +4,36 @@ from dotenv import load_dotenv
 # Load .env from project root (for local dev; Vercel uses dashboard env vars)
 load_dotenv(Path(__file__).resolve().parent.parent / '.env')
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_session import Session
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import text
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError, ProgrammingError
 import os
 import json
 import sys
-import re
+import threading
+import hmac
+import orjson
+import time
 from datetime import datetime
 from functools import wraps
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from ai_assistant import generate_application_advice
 from schemas import (
     RegisterSchema, LoginSchema, OpportunityCreateSchema, OpportunityUpdateSchema,
     UserProfileUpdateSchema, AdminPromoteSchema, SetupAdminSchema,
-    OpportunityQuerySchema, AIAdviceRequestSchema
+    OpportunityQuerySchema, AIAdviceRequestSchema, WVSU_EMAIL_SUFFIX,
+    password_strength_error
 )
 from marshmallow import ValidationError as MarshmallowValidationError
 
@@ -40,7 +48,21 @@ def get_fetcher_config():
     import fetcher_config
     return fetcher_config.FetcherConfig
 
+class OrjsonRequestProvider(DefaultJSONProvider):
+    """Parse request bodies (get_json/request.json) with orjson; responses keep Flask's encoder"""
+    def loads(self, s, **kwargs):
+        # orjson takes no options; callers passing any (e.g. the session serializer's
+        # object_hook for tuples/bytes) need the stdlib decoder
+        if kwargs:
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError subclasses ValueError, so Werkzeug's 400 handling is unchanged
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonRequestProvider(app)
+
+# Deployment environment, read once at import
+is_vercel = os.environ.get('VERCEL') is not None
 
 # Determine allowed origins from environment variable
 # Format: comma-separated list of origins, e.g., "http://localhost:8080,https://yourdomain.com"
@@ -49,7 +71,6 @@ if allowed_origins_str:
     allowed_origins = [origin.strip() for origin in allowed_origins_str.split(',') if origin.strip()]
 else:
     # Default to localhost for development
-    is_vercel = os.environ.get('VERCEL') is not None
     if is_vercel:
         # In production, require ALLOWED_ORIGINS to be set
         allowed_origins = []
@@ -69,17 +90,31 @@ CORS(app, resources={
 })
 
 # Initialize rate limiter
+# In-memory counters are per process, so on Vercel every instance counts separately.
+# Point RATELIMIT_STORAGE_URI at a shared store (e.g. redis://...) to enforce limits globally.
+ratelimit_storage_uri = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"  # Use in-memory storage (works for serverless)
+    storage_uri=ratelimit_storage_uri,
+    # One counter per key and limit: a single INCR + EXPIRE round-trip on a shared store
+    strategy='fixed-window',
+    # Fall back to per-instance counters rather than failing requests if the store is down
+    in_memory_fallback_enabled=True
 )
 
+def login_email_key():
+    """Rate-limit key for login attempts on one account, so brute force is capped across IPs"""
+    body = request.get_json(silent=True)
+    email = body.get('email') if isinstance(body, dict) else None
+    if isinstance(email, str) and email.strip():
+        return 'login:' + email.strip().lower()
+    return get_remote_address()
+
 # Session configuration
 # Use null sessions for serverless (Vercel) - sessions stored in cookies only
 # Filesystem sessions don't work on Vercel serverless functions
-is_vercel = os.environ.get('VERCEL') is not None
 if is_vercel:
     # On Vercel, use null session backend (sessions in cookies only)
     app.config['SESSION_TYPE'] = 'null'
@@ -89,7 +124,6 @@ else:
 
 # Require SECRET_KEY in production
 secret_key = os.environ.get('SECRET_KEY')
-is_vercel = os.environ.get('VERCEL') is not None
 
 if is_vercel and not secret_key:
     raise ValueError(
@@ -110,15 +144,16 @@ Session(app)
 # Database configuration
 # Force persistent database - no more in-memory SQLite
 database_url = os.environ.get('DATABASE_URL')
-is_postgres = False
 if not database_url:
     # Fallback to a persistent SQLite file
     database_url = 'sqlite:///campus_climb.db'
 elif database_url.startswith('postgres://'):
     database_url = database_url.replace('postgres://', 'postgresql://', 1)
-    is_postgres = True
-elif database_url.startswith('postgresql://'):
-    is_postgres = True
+if make_url(database_url).drivername == 'postgresql':
+    # SQLAlchemy 2.1 maps a bare postgresql:// to psycopg 3; requirements.txt ships psycopg2
+    database_url = database_url.replace('postgresql://', 'postgresql+psycopg2://', 1)
+# Backend name ignores the driver, so postgresql+psycopg2:// etc. count as Postgres too
+is_postgres = make_url(database_url).get_backend_name() == 'postgresql'
 
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -126,13 +161,16 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # Engine options - PostgreSQL-specific options only for PostgreSQL
 engine_options = {
     'pool_pre_ping': True,
+    # Compiled-SQL cache (default 500): room for every filter/pagination combination
+    # of the list endpoints plus the admin and migration statements, so warm
+    # instances never recompile
+    'query_cache_size': 1200,
 }
 if is_postgres:
     # PostgreSQL-specific options
     # For Supabase Session Pooler, limit pool size to avoid "max clients reached" errors
     # Session Pooler typically allows 15 connections for free tier
     # Use small pool size for serverless (each function instance gets its own pool)
-    is_vercel = os.environ.get('VERCEL') is not None
     if is_vercel:
         # Serverless: use small pool size to avoid exhausting Supabase Session Pooler
         # Session Pooler allows ~15 connections total, so we limit per instance
@@ -150,19 +188,87 @@ if is_postgres:
         engine_options['pool_size'] = 5
         engine_options['max_overflow'] = 5
     
-    engine_options['pool_recycle'] = 300  # Recycle connections after 5 minutes
-    engine_options['connect_args'] = {'connect_timeout': 10}
+    # Recycle connections after 30 minutes (override with DB_POOL_RECYCLE). Each reconnect
+    # through the Session Pooler costs a TLS handshake + auth; pool_pre_ping already
+    # weeds out connections the pooler has dropped in the meantime.
+    engine_options['pool_recycle'] = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+    engine_options['connect_args'] = {
+        'connect_timeout': 10,
+        # TCP keepalives so the kernel notices a dead socket before the next checkout
+        'keepalives': 1,
+        'keepalives_idle': 30,
+        'keepalives_interval': 10,
+        'keepalives_count': 3,
+    }
+    # INSERT executemany already uses SQLAlchemy 2.x "insertmanyvalues" (multi-row VALUES);
+    # also batch UPDATE/DELETE executemany (e.g. flushing several dirty rows) via execute_batch
+    engine_options['executemany_mode'] = 'values_plus_batch'
+    
+    # Server-side cap on any single statement so a runaway query can't hold one of the
+    # few pooled connections. Set once per new connection (kept for its whole life by
+    # the Session Pooler) rather than as a startup option, which poolers may reject.
+    statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '5000'))
+    
+    def set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET statement_timeout = {statement_timeout_ms}")
+        cursor.close()
+        # Commit so the SET survives a rollback of the first transaction
+        dbapi_connection.commit()
 else:
     # SQLite-specific options (if any)
     engine_options['connect_args'] = {'check_same_thread': False}
 
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
 
-db = SQLAlchemy(app)
+# Sessions are request-scoped, so keep loaded attributes after commit: handlers that
+# commit and then serialize the row (create/update/register) skip a refresh SELECT
+db = SQLAlchemy(app, session_options={'expire_on_commit': False})
+
+if is_postgres:
+    # Listen on the app's engine only; a listener on the Engine class would also fire for
+    # engines that scripts importing this module create for other databases
+    with app.app_context():
+        event.listen(db.engine, 'connect', set_statement_timeout)
+
+# Password hashing - argon2id tuned for a single serverless vCPU (OWASP minimum profile).
+# Legacy werkzeug pbkdf2 hashes still verify and are rehashed on the next successful login.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+_dummy_password_hash = None
+
+def verify_dummy_password(password):
+    """Spend a real hash verification on unknown emails so login timing doesn't reveal which accounts exist"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = password_hasher.hash('campus-climb-unknown-user')
+    try:
+        password_hasher.verify(_dummy_password_hash, password)
+    except (VerificationError, InvalidHashError):
+        pass
+
+def timestamp_now():
+    """SQL expression for the current time, used by the created_at/updated_at defaults"""
+    if is_postgres:
+        return db.func.now()
+    # SQLite's CURRENT_TIMESTAMP has no fractional seconds, so '... 12:00:00' sorts before the
+    # '... 12:00:00.000000' SQLAlchemy binds and keyset cursors never advance; store its format
+    return db.func.strftime('%Y-%m-%d %H:%M:%f000', 'now')
+
+def newest_first(column):
+    """DESC with NULLs (undated legacy rows) last; SQLite already sorts them last and rejects NULLS LAST in indexes"""
+    return column.desc().nulls_last() if is_postgres else column.desc()
+
+# Fields returned by User.to_dict, in response order
+USER_FIELDS = (
+    'id', 'email', 'first_name', 'last_name', 'is_admin', 'resume_summary',
+    'skills', 'career_goals', 'created_at', 'updated_at'
+)
 
 # Database Models
 class User(db.Model):
     __tablename__ = 'users'
+    # Read server-generated timestamps back with RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
@@ -174,14 +280,45 @@ class User(db.Model):
     resume_summary = db.Column(db.Text, nullable=True)
     skills = db.Column(db.Text, nullable=True)  # JSON string or comma-separated
     career_goals = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps come from the database clock. default= puts now() in the INSERT itself, since
+    # tables made by an older db.create_all() have no column DEFAULT for server_default to rely on
+    created_at = db.Column(db.DateTime, default=timestamp_now(), server_default=timestamp_now(), index=True)
+    updated_at = db.Column(db.DateTime, default=timestamp_now(), server_default=timestamp_now(),
+                           onupdate=timestamp_now())
+    
+    # Login looks users up case-insensitively by lower(email); unique so 'Foo@x' and
+    # 'foo@x' can't both register, even against legacy mixed-case rows
+    __table_args__ = (
+        db.Index('idx_users_email_lower', db.func.lower(email), unique=True),
+    )
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        if not self.password_hash.startswith('$argon2'):
+            # Legacy werkzeug hash (pbkdf2/scrypt)
+            return check_password_hash(self.password_hash, password)
+        try:
+            return password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def password_needs_rehash(self):
+        """Check if the stored hash is legacy or uses outdated argon2 parameters"""
+        if not self.password_hash.startswith('$argon2'):
+            return True
+        return password_hasher.check_needs_rehash(self.password_hash)
+    
+    @classmethod
+    def serialized_columns(cls):
+        """Columns needed by row_to_dict, for selecting plain rows instead of ORM objects"""
+        return [getattr(cls, field) for field in USER_FIELDS]
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Dict for a row selected with serialized_columns(); dates stay native for json_response"""
+        return row._asdict()
     
     def to_dict(self):
         return {
@@ -201,12 +338,20 @@ class User(db.Model):
         """Get user info formatted for AI assistant"""
         skills_list = []
         if self.skills:
-            try:
-                # Try parsing as JSON first
-                skills_list = json.loads(self.skills)
-            except:
+            skills = self.skills.strip()
+            parsed = None
+            # Only attempt JSON for values that look like a list, so the common
+            # comma-separated form doesn't pay for a failed parse and exception
+            if skills.startswith('['):
+                try:
+                    parsed = orjson.loads(skills)
+                except orjson.JSONDecodeError:
+                    pass
+            if parsed is not None:
+                skills_list = parsed
+            else:
                 # Fallback to comma-separated string
-                skills_list = [s.strip() for s in self.skills.split(',') if s.strip()]
+                skills_list = [s.strip() for s in skills.split(',') if s.strip()]
         
         return {
             'resume_summary': self.resume_summary or '',
@@ -214,15 +359,24 @@ class User(db.Model):
             'career_goals': self.career_goals or ''
         }
 
+# Fields returned by Opportunity.to_dict, in response order
+OPPORTUNITY_FIELDS = (
+    'id', 'title', 'company', 'location', 'type', 'category', 'description',
+    'requirements', 'salary', 'deadline', 'application_url', 'source', 'source_id',
+    'source_url', 'last_fetched', 'auto_fetched', 'created_at', 'updated_at'
+)
+
 class Opportunity(db.Model):
     __tablename__ = 'opportunities'
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False, index=True)
     company = db.Column(db.String(100), nullable=False)
     location = db.Column(db.String(100), nullable=False)
-    type = db.Column(db.String(50), nullable=False, index=True)
-    category = db.Column(db.String(50), nullable=False, index=True)
+    # No single-column indexes: type and category lead the composite indexes below
+    type = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text)
     salary = db.Column(db.String(50))
@@ -234,21 +388,50 @@ class Opportunity(db.Model):
     source_url = db.Column(db.String(500), nullable=True)  # Original URL
     last_fetched = db.Column(db.DateTime, nullable=True)  # When last updated from source
     auto_fetched = db.Column(db.Boolean, default=False, index=True)  # Whether fetched automatically
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_deleted = db.Column(db.Boolean, default=False, index=True)  # Soft delete flag
+    # Timestamps come from the database clock. default= puts now() in the INSERT itself, since
+    # tables made by an older db.create_all() have no column DEFAULT for server_default to rely on
+    created_at = db.Column(db.DateTime, default=timestamp_now(), server_default=timestamp_now(), index=True)
+    updated_at = db.Column(db.DateTime, default=timestamp_now(), server_default=timestamp_now(),
+                           onupdate=timestamp_now())
+    # Soft delete flag; NOT NULL so "active" is the single sargable predicate is_deleted = false
+    is_deleted = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False, index=True)
     
-    # Composite index for common query pattern
+    # Composite indexes for common query patterns
     __table_args__ = (
-        db.Index('idx_opp_active', 'is_deleted', 'type', 'category'),
+        # Partial: only active rows are indexed, matching active_query()
+        db.Index('idx_opp_active', 'type', 'category',
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
+        # idx_opp_active leads with type; the categories facet walks this one
+        db.Index('idx_opp_category_active', 'category',
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
+        # /api/opportunities filters on type/category over active rows and always sorts newest
+        # first, with undated legacy rows last (NULLS LAST must match the ORDER BY to serve it)
+        db.Index('idx_opp_type_cat_created', 'type', 'category', newest_first(created_at),
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
+        db.Index('idx_opp_type_created', 'type', newest_first(created_at),
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
+        db.Index('idx_opp_category_created', 'category', newest_first(created_at),
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
+        # Unfiltered list and cursor pages order by created_at DESC, id DESC over active rows
+        db.Index('idx_opp_created_id', newest_first(created_at), id.desc(),
+                 postgresql_where=is_deleted == False, sqlite_where=is_deleted == False),
     )
     
     @classmethod
     def active_query(cls):
         """Return a query filtered to only active (non-deleted) opportunities"""
-        return cls.query.filter(
-            (cls.is_deleted == False) | (cls.is_deleted.is_(None))
-        )
+        # Plain equality (not IS FALSE) so the planner can match the partial indexes
+        return cls.query.filter(cls.is_deleted == False)
+    
+    @classmethod
+    def serialized_columns(cls):
+        """Columns needed by row_to_dict, for selecting plain rows instead of ORM objects"""
+        return [getattr(cls, field) for field in OPPORTUNITY_FIELDS]
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Dict for a row selected with serialized_columns(); dates stay native for json_response"""
+        return row._asdict()
     
     def to_dict(self):
         return {
@@ -272,10 +455,144 @@ class Opportunity(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# Full-text search document for opportunities (PostgreSQL only).
+# Must stay identical to the idx_opportunities_search expression in
+# database/07_add_search_index.sql so the planner can use the GIN index.
+OPPORTUNITY_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(company, '') || ' ' || coalesce(description, ''))"
+)
+
 # Helper Functions
+def json_response(data, status=200):
+    """JSON response encoded with orjson, which writes datetimes/dates as ISO 8601 itself"""
+    return app.response_class(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), status=status, mimetype='application/json'
+    )
+
+# Unique indexes on users.email: the schema's UNIQUE constraint, SQLAlchemy's
+# unique=True index, and the case-insensitive lower(email) index
+EMAIL_UNIQUE_CONSTRAINTS = ('users_email_key', 'ix_users_email', 'idx_users_email_lower')
+
+def is_duplicate_email_error(error):
+    """True if an IntegrityError was raised by one of the unique indexes on users.email"""
+    orig = getattr(error, 'orig', None)
+    # psycopg2 names the violated constraint; SQLite only puts it in the message
+    constraint = getattr(getattr(orig, 'diag', None), 'constraint_name', None)
+    if constraint:
+        return constraint in EMAIL_UNIQUE_CONSTRAINTS
+    message = str(orig)
+    return 'UNIQUE' in message and (
+        'users.email' in message or any(name in message for name in EMAIL_UNIQUE_CONSTRAINTS)
+    )
+
+def secrets_match(provided, expected):
+    """Constant-time comparison for shared secrets and tokens, so timing doesn't leak a matching prefix"""
+    if not isinstance(provided, str) or not expected:
+        return False
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+def encode_opportunity_cursor(row):
+    """Build an opaque keyset cursor from the last opportunity row on a page"""
+    created_at = row.created_at.isoformat() if row.created_at else ''
+    return f"{created_at}_{row.id}"
+
+def decode_opportunity_cursor(cursor):
+    """Parse a cursor from encode_opportunity_cursor; raises ValueError if malformed.
+    created_at is None for cursors taken from a row without a timestamp."""
+    created_at, separator, opp_id = cursor.rpartition('_')
+    if not separator:
+        raise ValueError('cursor has no id')
+    return (datetime.fromisoformat(created_at) if created_at else None), int(opp_id)
+
 def is_wvsu_email(email):
     """Check if email ends with @wvstateu.edu"""
-    return email.lower().endswith('@wvstateu.edu')
+    # Only lowercase the suffix slice instead of copying the whole address
+    return email[-len(WVSU_EMAIL_SUFFIX):].lower() == WVSU_EMAIL_SUFFIX
+
+# Browser/CDN freshness for public opportunity listings and details
+OPPORTUNITY_CACHE_MAX_AGE = 60  # seconds
+
+# In-process cache for the opportunity type/category lists, which only change
+# when opportunities are written. Maps key -> (cached_at, values).
+FACET_CACHE_TTL = 300  # seconds
+_facet_cache = {}
+
+def get_cached_facet(key):
+    """Return cached facet values, or None if missing or expired"""
+    cached = _facet_cache.get(key)
+    if cached and time.monotonic() - cached[0] < FACET_CACHE_TTL:
+        return cached[1]
+    return None
+
+def set_cached_facet(key, values):
+    """Store facet values in the in-process cache"""
+    _facet_cache[key] = (time.monotonic(), values)
+
+def invalidate_facet_cache():
+    """Drop cached facets after an opportunity is created, updated or deleted"""
+    _facet_cache.clear()
+
+# In-process cache of serialized /api/opportunities pages, keyed by the validated
+# query parameters. Maps key -> (cached_at, body); the oldest entry is evicted once
+# it is full, so varied search strings and cursors can't grow it without bound.
+OPPORTUNITY_LIST_CACHE_SIZE = 256
+_opportunity_list_cache = {}
+_opportunity_list_cache_lock = threading.Lock()
+
+def get_cached_opportunity_list(key):
+    """Return a cached list response body, or None if missing or older than the client max-age"""
+    cached = _opportunity_list_cache.get(key)
+    if cached and time.monotonic() - cached[0] < OPPORTUNITY_CACHE_MAX_AGE:
+        return cached[1]
+    return None
+
+def set_cached_opportunity_list(key, body):
+    """Store a list response body, evicting the oldest entry when the cache is full"""
+    with _opportunity_list_cache_lock:
+        _opportunity_list_cache.pop(key, None)
+        if len(_opportunity_list_cache) >= OPPORTUNITY_LIST_CACHE_SIZE:
+            _opportunity_list_cache.pop(next(iter(_opportunity_list_cache)))
+        _opportunity_list_cache[key] = (time.monotonic(), body)
+
+def invalidate_opportunity_caches():
+    """Drop cached facets and list pages after opportunities are written"""
+    invalidate_facet_cache()
+    with _opportunity_list_cache_lock:
+        _opportunity_list_cache.clear()
+
+def cacheable_response(response, max_age):
+    """Add Cache-Control and a body ETag so clients and the CDN can skip or revalidate the request"""
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, stale-while-revalidate={max_age * 5}'
+    response.add_etag()
+    return response.make_conditional(request)
+
+def facet_response(values):
+    """Cacheable JSON response for the type/category lists"""
+    return cacheable_response(jsonify(values), FACET_CACHE_TTL)
+
+def distinct_active_values(column):
+    """Sorted distinct non-empty values of an Opportunity column across active rows"""
+    if is_postgres:
+        # Loose index scan: each step jumps to the next larger value through the
+        # btree index on the column, so cost grows with the number of distinct
+        # values rather than the number of rows
+        name = column.key
+        rows = db.session.execute(text(f"""
+            WITH RECURSIVE facet AS (
+                SELECT MIN({name}) AS value FROM opportunities WHERE is_deleted = FALSE
+                UNION ALL
+                SELECT (
+                    SELECT MIN({name}) FROM opportunities
+                    WHERE {name} > facet.value AND is_deleted = FALSE
+                )
+                FROM facet WHERE facet.value IS NOT NULL
+            )
+            SELECT value FROM facet WHERE value IS NOT NULL
+        """))
+    else:
+        rows = Opportunity.active_query().with_entities(column).distinct().order_by(column)
+    return [row[0] for row in rows if row[0]]
 
 def validate_password(password):
     """
@@ -292,14 +609,9 @@ def validate_password(password):
     if not password or len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not re.search(r'[A-Z]', password):
-        return False, "Password must contain at least one uppercase letter"
-    
-    if not re.search(r'[a-z]', password):
-        return False, "Password must contain at least one lowercase letter"
-    
-    if not re.search(r'\d', password):
-        return False, "Password must contain at least one digit"
+    error = password_strength_error(password)
+    if error:
+        return False, error
     
     return True, None
 
@@ -312,11 +624,13 @@ def validate_request(schema_class):
         def register():
             data = request.validated_data  # Validated and cleaned data
     """
+    # Schemas hold no per-request state, so build the field set once per endpoint
+    schema = schema_class()
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
-                schema = schema_class()
                 data = request.get_json() or {}
                 validated_data = schema.load(data)
                 # Store validated data in request object for easy access
@@ -332,58 +646,48 @@ def validate_request(schema_class):
     return decorator
 
 def get_current_user():
-    """Get current user from session or email parameter"""
+    """Get current user as a User.serialized_columns() row, resolved once per request and memoized on flask.g"""
+    if '_current_user' not in g:
+        g._current_user = _resolve_current_user()
+    return g._current_user
+
+def _resolve_current_user():
+    """Get current user from session, falling back to an email parameter (for serverless)"""
     from flask import session, request as flask_request
     
     # Try to get user from session first
     user_id = session.get('user_id')
     if user_id:
         try:
-            user = User.query.get(user_id)
+            user = User.query.with_entities(*User.serialized_columns()).filter(User.id == user_id).first()
             if user:
                 return user
         except Exception as e:
             print(f"Error getting user by ID {user_id}: {e}")
     
-    # Fallback 1: Check email in request args (for serverless)
+    # Fallback: one email credential, from the query string or else the JSON body
     email = flask_request.args.get('email')
-    if email:
-        try:
-            user = User.query.filter_by(email=email.lower().strip()).first()
-            if user:
-                # Try to create session for future requests
-                try:
-                    session['user_id'] = user.id
-                    session['email'] = user.email
-                except Exception as session_error:
-                    print(f"Warning: Could not set session: {session_error}")
-                return user
-        except Exception as e:
-            print(f"Error getting user by email from args: {e}")
-    
-    # Fallback 2: Check email in request JSON body (for POST requests)
-    if flask_request.is_json:
-        email = flask_request.json.get('email') if flask_request.json else None
-        if email:
-            try:
-                user = User.query.filter_by(email=email.lower().strip()).first()
-                if user:
-                    try:
-                        session['user_id'] = user.id
-                        session['email'] = user.email
-                    except Exception as session_error:
-                        print(f"Warning: Could not set session: {session_error}")
-                    return user
-            except Exception as e:
-                print(f"Error getting user by email from JSON: {e}")
-    
-    # Fallback 3: Check Authorization header (if frontend sends email)
-    auth_header = flask_request.headers.get('Authorization')
-    if auth_header and auth_header.startswith('Bearer '):
-        # Could implement token-based auth here if needed
-        pass
+    if not email and flask_request.is_json:
+        body = flask_request.get_json(silent=True)
+        email = body.get('email') if isinstance(body, dict) else None
+    if not email:
+        return None
     
-    return None
+    try:
+        user = User.query.with_entities(*User.serialized_columns()).filter(
+            User.email == email.lower().strip()
+        ).first()
+    except Exception as e:
+        print(f"Error getting user by email: {e}")
+        return None
+    if user:
+        # Try to create session for future requests
+        try:
+            session['user_id'] = user.id
+            session['email'] = user.email
+        except Exception as session_error:
+            print(f"Warning: Could not set session: {session_error}")
+    return user
 
 def admin_required(f):
     """Decorator to require admin authentication"""
@@ -419,14 +723,13 @@ def clean_test_opportunities():
             'Test Opportunity'
         ]
         
-        for title in test_titles:
-            test_opp = Opportunity.query.filter_by(title=title).first()
-            if test_opp:
-                test_opp.is_deleted = True
-        # Commit all changes at once
+        # One UPDATE ... WHERE title IN (...) instead of a SELECT per title
+        cleaned = Opportunity.active_query().filter(Opportunity.title.in_(test_titles)).update(
+            {Opportunity.is_deleted: True}, synchronize_session=False
+        )
         try:
             db.session.commit()
-            print(f"Cleaned test opportunities")
+            print(f"Cleaned {cleaned} test opportunities")
         except Exception as db_error:
             db.session.rollback()
             print(f"Error cleaning test opportunities: {db_error}")
@@ -435,8 +738,15 @@ def clean_test_opportunities():
         db.session.rollback()
 
 # Database initialization helper
+# Set once both tables have been seen; they are never dropped at runtime, so a
+# positive answer can skip the catalog query on init retries and later calls
+_tables_verified = False
+
 def tables_exist():
     """Check if database tables already exist"""
+    global _tables_verified
+    if _tables_verified:
+        return True
     try:
         from sqlalchemy import inspect
         inspector = inspect(db.engine)
@@ -445,7 +755,8 @@ def tables_exist():
         # We need both tables to exist
         has_users = 'users' in existing_tables or 'user' in existing_tables
         has_opportunities = 'opportunities' in existing_tables or 'opportunity' in existing_tables
-        return has_users and has_opportunities
+        _tables_verified = has_users and has_opportunities
+        return _tables_verified
     except Exception as e:
         # If inspection fails, assume tables don't exist
         print(f"Error checking tables: {e}")
@@ -480,27 +791,35 @@ app.init_db = init_db
 # Ensure database is initialized on first request in serverless environment
 # Only check once per serverless function instance
 _db_initialized = False
-
-def check_and_add_is_admin_column():
+_db_init_lock = threading.Lock()
+# Set once the column migrations have run in this process (also covers local dev,
+# where ensure_db_initialized is skipped)
+_columns_migrated = False
+
+def get_existing_columns():
+    """Return {(table_name, column_name)} for the users and opportunities tables in one query"""
+    if is_postgres:
+        result = db.session.execute(text("""
+            SELECT table_name, column_name 
+            FROM information_schema.columns 
+            WHERE table_schema = 'public' 
+            AND table_name IN ('users', 'opportunities')
+        """))
+    else:
+        # SQLite: no information_schema, but the PRAGMA table-valued functions can be unioned
+        result = db.session.execute(text("""
+            SELECT 'users', name FROM pragma_table_info('users')
+            UNION ALL
+            SELECT 'opportunities', name FROM pragma_table_info('opportunities')
+        """))
+    return {(row[0], row[1]) for row in result}
+
+def check_and_add_is_admin_column(existing_columns=None):
     """Check if is_admin column exists, add it if missing"""
     try:
-        # Check if PostgreSQL or SQLite
-        is_postgres = 'postgresql' in str(db.engine.url)
-        
-        if is_postgres:
-            # PostgreSQL: use information_schema
-            result = db.session.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = 'public' 
-                AND table_name = 'users' 
-                AND column_name = 'is_admin'
-            """))
-            column_exists = result.fetchone() is not None
-        else:
-            # SQLite: use PRAGMA table_info
-            result = db.session.execute(text("PRAGMA table_info(users)"))
-            column_exists = any(row[1] == 'is_admin' for row in result.fetchall())
+        if existing_columns is None:
+            existing_columns = get_existing_columns()
+        column_exists = ('users', 'is_admin') in existing_columns
         
         if not column_exists:
             print("is_admin column missing. Adding it...")
@@ -539,26 +858,12 @@ def check_and_add_is_admin_column():
         db.session.rollback()
         return False
 
-def check_and_add_user_profile_columns():
+def check_and_add_user_profile_columns(existing_columns=None):
     """Check if user profile columns exist, add them if missing"""
     try:
-        # Check if PostgreSQL or SQLite
-        is_postgres = 'postgresql' in str(db.engine.url)
-        
-        if is_postgres:
-            # PostgreSQL: use information_schema
-            result = db.session.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = 'public' 
-                AND table_name = 'users' 
-                AND column_name IN ('resume_summary', 'skills', 'career_goals')
-            """))
-            existing_columns = {row[0] for row in result.fetchall()}
-        else:
-            # SQLite: use PRAGMA table_info
-            result = db.session.execute(text("PRAGMA table_info(users)"))
-            existing_columns = {row[1] for row in result.fetchall()}
+        if existing_columns is None:
+            existing_columns = get_existing_columns()
+        existing_columns = {column for table, column in existing_columns if table == 'users'}
         
         columns_to_add = []
         if 'resume_summary' not in existing_columns:
@@ -595,43 +900,29 @@ def check_and_add_user_profile_columns():
         db.session.rollback()
         return False
 
-def check_and_add_opportunity_source_columns():
+def check_and_add_opportunity_source_columns(existing_columns=None):
     """Check if opportunity source columns exist, add them if missing"""
     try:
-        database_url = app.config.get('SQLALCHEMY_DATABASE_URI', '')
-        is_sqlite = 'sqlite' in database_url.lower()
-        
         # Check which columns exist
-        if is_sqlite:
-            # SQLite: Use PRAGMA table_info
-            result = db.session.execute(text("PRAGMA table_info(opportunities)"))
-            existing_columns = {row[1] for row in result.fetchall()}  # Column name is at index 1
-        else:
-            # PostgreSQL: Use information_schema
-            result = db.session.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = 'public' 
-                AND table_name = 'opportunities' 
-                AND column_name IN ('source', 'source_id', 'source_url', 'last_fetched', 'auto_fetched')
-            """))
-            existing_columns = {row[0] for row in result.fetchall()}
+        if existing_columns is None:
+            existing_columns = get_existing_columns()
+        existing_columns = {column for table, column in existing_columns if table == 'opportunities'}
         
         columns_to_add = []
         if 'source' not in existing_columns:
-            columns_to_add.append(('source', 'VARCHAR(50)' if not is_sqlite else 'TEXT'))
+            columns_to_add.append(('source', 'VARCHAR(50)' if is_postgres else 'TEXT'))
         if 'source_id' not in existing_columns:
-            columns_to_add.append(('source_id', 'VARCHAR(200)' if not is_sqlite else 'TEXT'))
+            columns_to_add.append(('source_id', 'VARCHAR(200)' if is_postgres else 'TEXT'))
         if 'source_url' not in existing_columns:
-            columns_to_add.append(('source_url', 'VARCHAR(500)' if not is_sqlite else 'TEXT'))
+            columns_to_add.append(('source_url', 'VARCHAR(500)' if is_postgres else 'TEXT'))
         if 'last_fetched' not in existing_columns:
-            columns_to_add.append(('last_fetched', 'TIMESTAMP' if not is_sqlite else 'DATETIME'))
+            columns_to_add.append(('last_fetched', 'TIMESTAMP' if is_postgres else 'DATETIME'))
         if 'auto_fetched' not in existing_columns:
-            columns_to_add.append(('auto_fetched', 'BOOLEAN DEFAULT FALSE' if not is_sqlite else 'INTEGER DEFAULT 0'))
+            columns_to_add.append(('auto_fetched', 'BOOLEAN DEFAULT FALSE' if is_postgres else 'INTEGER DEFAULT 0'))
         
         if columns_to_add:
             print(f"Opportunity source columns missing. Adding: {', '.join([c[0] for c in columns_to_add])}...")
-            table_name = 'opportunities' if is_sqlite else 'public.opportunities'
+            table_name = 'public.opportunities' if is_postgres else 'opportunities'
             for column_name, column_type in columns_to_add:
                 try:
                     db.session.execute(text(f"""
@@ -643,7 +934,7 @@ def check_and_add_opportunity_source_columns():
                     print(f"Warning: Could not add column {column_name}: {col_error}")
             
             # Create indexes (SQLite and PostgreSQL both support IF NOT EXISTS)
-            index_prefix = '' if is_sqlite else 'public.'
+            index_prefix = 'public.' if is_postgres else ''
             try:
                 if 'source' not in existing_columns:
                     db.session.execute(text(f"""
@@ -693,6 +984,54 @@ def check_and_add_opportunity_source_columns():
         db.session.rollback()
         return False
 
+def backfill_is_deleted():
+    """Set legacy NULL is_deleted values to FALSE; active_query() matches is_deleted = FALSE only"""
+    try:
+        table_name = 'public.opportunities' if is_postgres else 'opportunities'
+        result = db.session.execute(
+            text(f"UPDATE {table_name} SET is_deleted = FALSE WHERE is_deleted IS NULL")
+        )
+        db.session.commit()
+        if result.rowcount:
+            print(f"Backfilled is_deleted on {result.rowcount} opportunities")
+        return True
+    except Exception as e:
+        print(f"Error backfilling is_deleted: {e}")
+        import traceback
+        traceback.print_exc()
+        db.session.rollback()
+        return False
+
+def run_column_migrations():
+    """Run every check_and_add_* migration against a single read of the existing columns.
+    Returns False if the columns couldn't be read or legacy rows couldn't be backfilled,
+    so the caller retries on a later request."""
+    try:
+        existing_columns = get_existing_columns()
+    except Exception as e:
+        print(f"Error reading existing columns: {e}")
+        db.session.rollback()
+        return False
+    check_and_add_is_admin_column(existing_columns)
+    check_and_add_user_profile_columns(existing_columns)
+    check_and_add_opportunity_source_columns(existing_columns)
+    # 09_is_deleted_not_null.sql does the same; run it here so the listings don't depend on it
+    return backfill_is_deleted()
+
+def ensure_columns_migrated():
+    """Run the check_and_add_* column migrations once per process instead of per request"""
+    global _columns_migrated
+    if _db_initialized or _columns_migrated:
+        return
+    with _db_init_lock:
+        if _db_initialized or _columns_migrated:
+            return
+        try:
+            if run_column_migrations():
+                _columns_migrated = True
+        except Exception as migration_error:
+            print(f"Migration check failed (non-critical): {migration_error}")
+
 @app.before_request
 def ensure_db_initialized():
     """
@@ -703,43 +1042,53 @@ def ensure_db_initialized():
     tables will already exist and this will just verify.
     """
     global _db_initialized
-    is_vercel = os.environ.get('VERCEL') is not None
+    # Warm path: a single boolean read, no lock
+    if _db_initialized:
+        return
+    if not is_vercel:
+        return
     
-    # Always check on Vercel, but only once per function instance
-    if is_vercel and not _db_initialized:
+    # Only one thread per function instance runs the initialization
+    with _db_init_lock:
+        if _db_initialized:
+            return
+        from sqlalchemy.exc import TimeoutError, OperationalError
         try:
-            # Test database connection first with timeout handling
-            from sqlalchemy.exc import TimeoutError, OperationalError
-            try:
-                db.session.execute(text('SELECT 1'))
-            except (TimeoutError, OperationalError) as conn_err:
-                # If connection pool is exhausted, skip initialization for this request
-                # It will be retried on the next request
-                error_msg = str(conn_err)
-                if 'QueuePool' in error_msg or 'connection' in error_msg.lower() or 'timeout' in error_msg.lower():
-                    print(f"Database connection unavailable during initialization (will retry): {conn_err}")
-                    return  # Don't fail the request, just skip initialization
-                raise  # Re-raise other operational errors
+            # No separate SELECT 1 probe: pool_pre_ping already validates the connection
+            # on checkout, and the queries below surface the same errors
             
             # Check if tables exist
             if not tables_exist():
                 print("Tables don't exist in serverless. Creating them...")
-                db.create_all()
-                db.session.commit()
-                print("Database tables created in serverless environment")
+                try:
+                    db.create_all()
+                    db.session.commit()
+                    print("Database tables created in serverless environment")
+                except (IntegrityError, ProgrammingError) as create_error:
+                    # Another cold-starting instance created the tables first
+                    db.session.rollback()
+                    if not tables_exist():
+                        raise
+                    print(f"Tables created concurrently by another instance: {create_error}")
             else:
                 print("Database tables already exist (verified)")
             
-            # Check and add is_admin column if missing
-            check_and_add_is_admin_column()
-            
-            # Check and add user profile columns if missing
-            check_and_add_user_profile_columns()
-            
-            # Check and add opportunity source columns if missing
-            check_and_add_opportunity_source_columns()
+            # Add any missing is_admin, user profile and opportunity source columns;
+            # leave _db_initialized unset if they couldn't be checked, so the next request retries
+            if not run_column_migrations():
+                return
             
             _db_initialized = True
+        except (TimeoutError, OperationalError) as conn_err:
+            # If connection pool is exhausted, skip initialization for this request
+            # It will be retried on the next request
+            error_msg = str(conn_err)
+            if 'QueuePool' in error_msg or 'connection' in error_msg.lower() or 'timeout' in error_msg.lower():
+                print(f"Database connection unavailable during initialization (will retry): {conn_err}")
+                return  # Don't fail the request, just skip initialization
+            print(f"Database initialization error: {conn_err}")
+            import traceback
+            traceback.print_exc()
         except Exception as e:
             print(f"Database initialization error: {e}")
             import traceback
@@ -748,29 +1097,37 @@ def ensure_db_initialized():
             # Don't set _db_initialized to True on error, so we can retry
             # But don't fail the request - let individual endpoints handle errors
 
+# Constant bodies for the liveness endpoints, serialized once at import
+TEST_RESPONSE_BODY = json.dumps(
+    {'message': 'API is working!', 'status': 'success'}, separators=(',', ':'), sort_keys=True
+)
+HEALTHY_RESPONSE_BODY = json.dumps({
+    'status': 'healthy',
+    'message': 'API is running with database',
+    'database': 'connected'
+}, separators=(',', ':'), sort_keys=True)
+
 @app.route('/api/test', methods=['GET'])
 def test():
     """Test endpoint - only available in development"""
     # Only allow in development (not on Vercel)
-    if os.environ.get('VERCEL'):
+    if is_vercel:
         return jsonify({'error': 'Not found'}), 404
     
-    return jsonify({
-        'message': 'API is working!',
-        'status': 'success'
-    })
+    return app.response_class(TEST_RESPONSE_BODY, mimetype='application/json')
 
 @app.route('/api/test/admin-fetch', methods=['POST'])
 def test_admin_fetch():
     """Test endpoint - only available in development"""
     # Only allow in development (not on Vercel)
-    if os.environ.get('VERCEL'):
+    if is_vercel:
         return jsonify({'error': 'Not found'}), 404
     
     try:
         fetch_all_opportunities, _ = get_fetch_functions()
         with app.app_context():
             results = fetch_all_opportunities()
+        invalidate_opportunity_caches()
         
         return jsonify({
             'message': 'Test fetch completed',
@@ -786,7 +1143,7 @@ def test_admin_fetch():
 def test_register():
     """Test endpoint - only available in development"""
     # Only allow in development (not on Vercel)
-    if os.environ.get('VERCEL'):
+    if is_vercel:
         return jsonify({'error': 'Not found'}), 404
     
     try:
@@ -806,11 +1163,7 @@ def health():
     try:
         # Test database connection
         db.session.execute(text('SELECT 1'))
-        return jsonify({
-            'status': 'healthy',
-            'message': 'API is running with database',
-            'database': 'connected'
-        })
+        return app.response_class(HEALTHY_RESPONSE_BODY, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'status': 'degraded',
@@ -818,25 +1171,31 @@ def health():
             'error': str(e)
         }), 500
 
+opportunity_query_schema = OpportunityQuerySchema()
+
 @app.route('/api/opportunities', methods=['GET'])
 def opportunities():
     try:
         # Validate query parameters
         try:
-            schema = OpportunityQuerySchema()
-            validated_params = schema.load(request.args.to_dict())
+            validated_params = opportunity_query_schema.load(request.args.to_dict())
         except MarshmallowValidationError as err:
             error_message = list(err.messages.values())[0][0] if err.messages else 'Invalid query parameters'
             return jsonify({'error': error_message, 'details': err.messages}), 400
         
-        # Ensure database connection
-        db.session.execute(text('SELECT 1'))
+        # Serve a repeat of a recent identical query from memory, without touching the database
+        cache_key = tuple(sorted(validated_params.items()))
+        cached_body = get_cached_opportunity_list(cache_key)
+        if cached_body is not None:
+            return cacheable_response(
+                app.response_class(cached_body, mimetype='application/json'), OPPORTUNITY_CACHE_MAX_AGE
+            )
         
-        # Check and add source columns if missing (migration)
-        try:
-            check_and_add_opportunity_source_columns()
-        except Exception as migration_error:
-            print(f"Source columns migration check failed (non-critical): {migration_error}")
+        # No SELECT 1 probe here: pool_pre_ping already checks the connection
+        # on checkout, and a real failure is caught and reported below
+
+        # Check and add missing columns (migration) - once per process
+        ensure_columns_migrated()
         
         # Read from database - use active_query to filter out deleted opportunities
         query = Opportunity.active_query()
@@ -851,31 +1210,90 @@ def opportunities():
         if category_filter:
             query = query.filter(Opportunity.category == category_filter)
         if search_query:
-            query = query.filter(
-                Opportunity.title.contains(search_query) |
-                Opportunity.company.contains(search_query) |
-                Opportunity.description.contains(search_query)
-            )
+            if is_postgres:
+                # Single GIN index probe instead of three LIKE '%q%' scans
+                query = query.filter(
+                    text(f"{OPPORTUNITY_SEARCH_DOCUMENT} @@ plainto_tsquery('english', :search)")
+                    .bindparams(search=search_query)
+                )
+            else:
+                query = query.filter(
+                    Opportunity.title.contains(search_query) |
+                    Opportunity.company.contains(search_query) |
+                    Opportunity.description.contains(search_query)
+                )
         
         # Pagination
         page = validated_params.get('page', 1)
         per_page = validated_params.get('per_page', 50)
+        cursor = validated_params.get('cursor')
         
-        pagination = query.order_by(Opportunity.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        # Select plain column tuples so rows skip ORM identity-map and attribute instrumentation
+        query = query.with_entities(*Opportunity.serialized_columns()).order_by(
+            newest_first(Opportunity.created_at), Opportunity.id.desc()
         )
         
-        return jsonify({
-            'opportunities': [opp.to_dict() for opp in pagination.items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
-        })
+        if cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            # instead of OFFSET, and skip the COUNT(*) query entirely
+            try:
+                cursor_created_at, cursor_id = decode_opportunity_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            if cursor_created_at is None:
+                # Already into the undated rows at the end of the list
+                query = query.filter(Opportunity.created_at.is_(None), Opportunity.id < cursor_id)
+            else:
+                query = query.filter(
+                    (Opportunity.created_at < cursor_created_at) |
+                    ((Opportunity.created_at == cursor_created_at) & (Opportunity.id < cursor_id)) |
+                    Opportunity.created_at.is_(None)
+                )
+            rows = query.limit(per_page + 1).all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            response = json_response({
+                'opportunities': [Opportunity.row_to_dict(row) for row in rows],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': has_next,
+                    'next_cursor': encode_opportunity_cursor(rows[-1]) if has_next else None
+                }
+            })
+        elif validated_params.get('include_total'):
+            # Totals cost a second, full COUNT(*) over the filtered rows; only on request
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            
+            response = json_response({
+                'opportunities': [Opportunity.row_to_dict(row) for row in pagination.items],
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': pagination.total,
+                    'pages': pagination.pages,
+                    'has_next': pagination.has_next,
+                    'has_prev': pagination.has_prev,
+                    'next_cursor': encode_opportunity_cursor(pagination.items[-1]) if pagination.has_next else None
+                }
+            })
+        else:
+            # One query per page: fetch a single extra row to learn whether another page exists
+            rows = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            response = json_response({
+                'opportunities': [Opportunity.row_to_dict(row) for row in rows],
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'has_next': has_next,
+                    'has_prev': page > 1,
+                    'next_cursor': encode_opportunity_cursor(rows[-1]) if has_next else None
+                }
+            })
+        
+        set_cached_opportunity_list(cache_key, response.get_data())
+        return cacheable_response(response, OPPORTUNITY_CACHE_MAX_AGE)
     except Exception as e:
         print(f"Error in opportunities endpoint: {e}")
         import traceback
@@ -886,13 +1304,10 @@ def opportunities():
 def get_opportunity(id):
     """Get a specific opportunity by ID"""
     try:
-        opportunity = Opportunity.query.filter(
-            Opportunity.id == id,
-            (Opportunity.is_deleted == False) | (Opportunity.is_deleted.is_(None))
-        ).first()
-        if not opportunity:
+        opportunity = db.session.get(Opportunity, id)
+        if not opportunity or opportunity.is_deleted:
             return jsonify({'error': 'Opportunity not found'}), 404
-        return jsonify(opportunity.to_dict())
+        return cacheable_response(jsonify(opportunity.to_dict()), OPPORTUNITY_CACHE_MAX_AGE)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -900,23 +1315,13 @@ def get_opportunity(id):
 def get_opportunity_types():
     """Get all unique opportunity types"""
     try:
-        # Ensure database connection with timeout
-        try:
-            db.session.execute(text('SELECT 1'))
-        except Exception as conn_err:
-            print(f"Database connection error in get_opportunity_types: {conn_err}")
-            db.session.rollback()
-            # Return empty list instead of error to prevent UI issues
-            return jsonify([])
+        cached = get_cached_facet('types')
+        if cached is not None:
+            return facet_response(cached)
         
-        types = db.session.query(Opportunity.type).filter(
-            Opportunity.id.in_(
-                db.session.query(Opportunity.id).filter(
-                    (Opportunity.is_deleted == False) | (Opportunity.is_deleted.is_(None))
-                )
-            )
-        ).distinct().all()
-        return jsonify([t[0] for t in types if t[0]])  # Filter out None values
+        values = distinct_active_values(Opportunity.type)
+        set_cached_facet('types', values)
+        return facet_response(values)
     except Exception as e:
         print(f"Error in get_opportunity_types: {e}")
         import traceback
@@ -929,23 +1334,13 @@ def get_opportunity_types():
 def get_opportunity_categories():
     """Get all unique opportunity categories"""
     try:
-        # Ensure database connection with timeout
-        try:
-            db.session.execute(text('SELECT 1'))
-        except Exception as conn_err:
-            print(f"Database connection error in get_opportunity_categories: {conn_err}")
-            db.session.rollback()
-            # Return empty list instead of error to prevent UI issues
-            return jsonify([])
+        cached = get_cached_facet('categories')
+        if cached is not None:
+            return facet_response(cached)
         
-        categories = db.session.query(Opportunity.category).filter(
-            Opportunity.id.in_(
-                db.session.query(Opportunity.id).filter(
-                    (Opportunity.is_deleted == False) | (Opportunity.is_deleted.is_(None))
-                )
-            )
-        ).distinct().all()
-        return jsonify([c[0] for c in categories if c[0]])  # Filter out None values
+        values = distinct_active_values(Opportunity.category)
+        set_cached_facet('categories', values)
+        return facet_response(values)
     except Exception as e:
         print(f"Error in get_opportunity_categories: {e}")
         import traceback
@@ -974,52 +1369,22 @@ def register():
         first_name = data['first_name'].strip()
         last_name = data['last_name'].strip()
 
-        # Check and add is_admin column if missing (migration)
-        try:
-            check_and_add_is_admin_column()
-        except Exception as migration_error:
-            print(f"Migration check failed (non-critical): {migration_error}")
-
-        # Check and add user profile columns if missing (migration)
-        try:
-            check_and_add_user_profile_columns()
-        except Exception as migration_error:
-            print(f"Profile columns migration check failed (non-critical): {migration_error}")
-
-        # Uniqueness check
-        try:
-            existing_user = User.query.filter_by(email=email).first()
-            if existing_user:
-                return jsonify({'error': 'Email already registered'}), 409
-        except Exception as query_error:
-            # Check if it's the is_admin column error
-            error_str = str(query_error)
-            if 'is_admin' in error_str and 'does not exist' in error_str:
-                print("is_admin column missing. Attempting migration...")
-                try:
-                    check_and_add_is_admin_column()
-                    # Retry the query
-                    existing_user = User.query.filter_by(email=email).first()
-                    if existing_user:
-                        return jsonify({'error': 'Email already registered'}), 409
-                except Exception as retry_error:
-                    print(f"Migration failed: {retry_error}")
-                    import traceback
-                    traceback.print_exc()
-                    return jsonify({'error': 'Database migration required. Please contact support or run database/04_add_admin_column.sql manually.'}), 500
-            else:
-                print(f"Error checking existing user: {query_error}")
-                import traceback
-                traceback.print_exc()
-                db.session.rollback()
-                return jsonify({'error': f'Database query error: {str(query_error)}'}), 500
+        # Check and add missing columns (migration) - once per process
+        ensure_columns_migrated()
 
-        # Create user
+        # Create user - the unique index on email rejects duplicates,
+        # so no existence SELECT is needed before the insert
         try:
             user = User(email=email, first_name=first_name, last_name=last_name)
             user.set_password(password)
             db.session.add(user)
             db.session.commit()
+        except IntegrityError as integrity_error:
+            db.session.rollback()
+            if is_duplicate_email_error(integrity_error):
+                return jsonify({'error': 'Email already registered'}), 409
+            print(f"Database error during registration: {integrity_error}")
+            return jsonify({'error': 'Registration failed. Please try again later.'}), 500
         except Exception as db_error:
             db.session.rollback()
             print(f"Database error during registration: {db_error}")
@@ -1048,6 +1413,7 @@ def register():
 
 @app.route('/api/auth/login', methods=['POST'])
 @limiter.limit("10 per minute")
+@limiter.limit("20 per hour", key_func=login_email_key)
 @validate_request(LoginSchema)
 def login():
     """Authenticate existing user. Only WVSU emails allowed. No mock users."""
@@ -1093,7 +1459,7 @@ def login():
                     'error': 'Database connection failed: DATABASE_URL environment variable is not set. Please configure it in Vercel.',
                     'debug': {
                         'has_database_url': False,
-                        'is_vercel': os.environ.get('VERCEL') is not None
+                        'is_vercel': is_vercel
                     }
                 }), 500
             else:
@@ -1103,7 +1469,7 @@ def login():
                         'error': 'Database connection pool exhausted. Please try again in a few moments.',
                         'debug': {
                             'has_database_url': True,
-                            'is_vercel': os.environ.get('VERCEL') is not None,
+                            'is_vercel': is_vercel,
                             'error_type': 'PoolExhaustion',
                             'retries': max_attempts
                         }
@@ -1114,7 +1480,7 @@ def login():
                         'error': 'Database connection failed. Please check your DATABASE_URL configuration.',
                         'debug': {
                             'has_database_url': True,
-                            'is_vercel': os.environ.get('VERCEL') is not None,
+                            'is_vercel': is_vercel,
                             'error_type': type(conn_error).__name__,
                             'error_preview': error_msg[:100] if len(error_msg) > 100 else error_msg
                         }
@@ -1128,23 +1494,14 @@ def login():
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
         
-        # Check and add missing columns (migration)
-        try:
-            check_and_add_is_admin_column()
-            check_and_add_user_profile_columns()
-            check_and_add_opportunity_source_columns()
-        except Exception as migration_error:
-            print(f"Migration check failed (non-critical): {migration_error}")
+        # Check and add missing columns (migration) - once per process
+        ensure_columns_migrated()
 
         try:
-            # Try case-insensitive email lookup for PostgreSQL
-            is_postgres = 'postgresql' in str(db.engine.url) or 'postgres' in str(db.engine.url)
-            if is_postgres:
-                # PostgreSQL: use ILIKE for case-insensitive search
-                user = User.query.filter(User.email.ilike(email)).first()
-            else:
-                # SQLite: email is already lowercased, so direct match
-                user = User.query.filter_by(email=email).first()
+            # Case-insensitive match for accounts stored with mixed-case emails.
+            # lower(email) = :email is served by idx_users_email_lower; ILIKE could
+            # not use an index and treated '_' in addresses as a wildcard.
+            user = User.query.filter(db.func.lower(User.email) == email).first()
         except Exception as query_error:
             # Check if it's a missing column error
             error_str = str(query_error)
@@ -1154,7 +1511,7 @@ def login():
                     check_and_add_is_admin_column()
                     check_and_add_user_profile_columns()
                     # Retry the query
-                    user = User.query.filter_by(email=email).first()
+                    user = User.query.filter(db.func.lower(User.email) == email).first()
                 except Exception as retry_error:
                     print(f"Migration failed: {retry_error}")
                     import traceback
@@ -1171,6 +1528,7 @@ def login():
             # User doesn't exist - enforce WVSU email requirement
             if not is_wvsu_email(email):
                 return jsonify({'error': 'Only WVSU email addresses (@wvstateu.edu) are allowed'}), 400
+            verify_dummy_password(password)
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # User exists - allow admin users regardless of email domain
@@ -1190,6 +1548,15 @@ def login():
             traceback.print_exc()
             return jsonify({'error': 'Authentication error'}), 500
 
+        # Roll legacy/outdated hashes forward now that we have the plaintext
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except Exception as rehash_error:
+                db.session.rollback()
+                print(f"Password rehash failed (non-critical): {rehash_error}")
+
         # Create session
         try:
             from flask import session
@@ -1225,7 +1592,7 @@ def get_current_user_endpoint():
     try:
         user = get_current_user()
         if user:
-            return jsonify({'user': user.to_dict()})
+            return json_response({'user': User.row_to_dict(user)})
         return jsonify({'error': 'Not authenticated'}), 401
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1236,8 +1603,10 @@ def get_current_user_endpoint():
 def admin_get_opportunities():
     """Get all opportunities for admin (including deleted)"""
     try:
-        opportunities = Opportunity.query.order_by(Opportunity.created_at.desc()).all()
-        return jsonify([opp.to_dict() for opp in opportunities])
+        rows = Opportunity.query.with_entities(*Opportunity.serialized_columns()).order_by(
+            Opportunity.created_at.desc()
+        ).all()
+        return json_response([Opportunity.row_to_dict(row) for row in rows])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1266,6 +1635,7 @@ def admin_create_opportunity():
         
         db.session.add(new_opportunity)
         db.session.commit()
+        invalidate_opportunity_caches()
         
         return jsonify({
             'message': 'Opportunity created successfully',
@@ -1281,7 +1651,7 @@ def admin_create_opportunity():
 def admin_update_opportunity(id):
     """Update an opportunity"""
     try:
-        opportunity = Opportunity.query.get(id)
+        opportunity = db.session.get(Opportunity, id)
         if not opportunity:
             return jsonify({'error': 'Opportunity not found'}), 404
         
@@ -1314,6 +1684,7 @@ def admin_update_opportunity(id):
         
         try:
             db.session.commit()
+            invalidate_opportunity_caches()
             return jsonify({
                 'message': 'Opportunity updated successfully',
                 'opportunity': opportunity.to_dict()
@@ -1330,13 +1701,14 @@ def admin_update_opportunity(id):
 def admin_delete_opportunity(id):
     """Delete an opportunity (soft delete)"""
     try:
-        opportunity = Opportunity.query.get(id)
+        opportunity = db.session.get(Opportunity, id)
         if not opportunity:
             return jsonify({'error': 'Opportunity not found'}), 404
         
         opportunity.is_deleted = True
         try:
             db.session.commit()
+            invalidate_opportunity_caches()
             return jsonify({'message': 'Opportunity deleted successfully'})
         except Exception as db_error:
             db.session.rollback()
@@ -1353,8 +1725,10 @@ def admin_delete_opportunity(id):
 def admin_get_users():
     """Get all users for admin"""
     try:
-        users = User.query.order_by(User.created_at.desc()).all()
-        return jsonify([user.to_dict() for user in users])
+        rows = User.query.with_entities(*User.serialized_columns()).order_by(
+            User.created_at.desc()
+        ).all()
+        return json_response([User.row_to_dict(row) for row in rows])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1363,17 +1737,26 @@ def admin_get_users():
 def admin_dashboard():
     """Get admin dashboard data"""
     try:
-        total_users = User.query.count()
-        total_opportunities = Opportunity.query.filter_by(is_deleted=False).count()
+        # Both totals in one round-trip as scalar subqueries of a single SELECT
+        total_users, total_opportunities = db.session.query(
+            User.query.with_entities(db.func.count(User.id)).scalar_subquery(),
+            Opportunity.query.filter_by(is_deleted=False).with_entities(
+                db.func.count(Opportunity.id)
+            ).scalar_subquery()
+        ).one()
         
-        recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-        recent_opportunities = Opportunity.query.filter_by(is_deleted=False).order_by(Opportunity.created_at.desc()).limit(5).all()
+        recent_users = User.query.with_entities(*User.serialized_columns()).order_by(
+            User.created_at.desc()
+        ).limit(5).all()
+        recent_opportunities = Opportunity.query.filter_by(is_deleted=False).with_entities(
+            *Opportunity.serialized_columns()
+        ).order_by(Opportunity.created_at.desc()).limit(5).all()
         
-        return jsonify({
+        return json_response({
             'total_users': total_users,
             'total_opportunities': total_opportunities,
-            'recent_users': [user.to_dict() for user in recent_users],
-            'recent_opportunities': [opp.to_dict() for opp in recent_opportunities]
+            'recent_users': [User.row_to_dict(row) for row in recent_users],
+            'recent_opportunities': [Opportunity.row_to_dict(row) for row in recent_opportunities]
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1388,6 +1771,7 @@ def admin_fetch_opportunities():
         try:
             with app.app_context():
                 results = fetch_all_opportunities()
+            invalidate_opportunity_caches()
         finally:
             # Always cleanup database session to release connections
             try:
@@ -1462,7 +1846,7 @@ def cron_fetch_opportunities():
         cron_secret = os.environ.get('CRON_SECRET')
         if cron_secret:
             provided_secret = request.headers.get('X-Cron-Secret') or request.args.get('secret')
-            if provided_secret != cron_secret:
+            if not secrets_match(provided_secret, cron_secret):
                 return jsonify({'error': 'Unauthorized'}), 401
         
         print("Cron job triggered: Fetching opportunities...")
@@ -1470,6 +1854,7 @@ def cron_fetch_opportunities():
         # Ensure we're in app context for database operations
         with app.app_context():
             results = fetch_all_opportunities()
+        invalidate_opportunity_caches()
         return jsonify({
             'message': 'Cron job completed',
             'results': results
@@ -1499,10 +1884,10 @@ def admin_promote_user():
         secret_key = data['secret_key']
         email = data['email'].lower().strip()
         
-        if secret_key != admin_secret:
+        if not secrets_match(secret_key, admin_secret):
             return jsonify({'error': 'Invalid secret key'}), 403
         
-        user = User.query.filter_by(email=email).first()
+        user = User.query.filter(db.func.lower(User.email) == email).first()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -1526,10 +1911,10 @@ def debug_check_user():
     Only available in development or with DEBUG_TOKEN.
     """
     # Only allow in development or with DEBUG_TOKEN
-    if os.environ.get('VERCEL'):
+    if is_vercel:
         debug_token = os.environ.get('DEBUG_TOKEN')
         provided_token = request.headers.get('X-Debug-Token') or (request.json.get('debug_token') if request.is_json else None)
-        if not debug_token or provided_token != debug_token:
+        if not secrets_match(provided_token, debug_token):
             return jsonify({'error': 'Not found'}), 404
     
     try:
@@ -1539,8 +1924,6 @@ def debug_check_user():
         if not email:
             return jsonify({'error': 'Email is required'}), 400
         
-        is_postgres = 'postgresql' in str(db.engine.url) or 'postgres' in str(db.engine.url)
-        
         # Try case-insensitive lookup for PostgreSQL
         if is_postgres:
             user = User.query.filter(User.email.ilike(email)).first()
@@ -1604,7 +1987,7 @@ def setup_admin_user():
         setup_token = os.environ.get('SETUP_TOKEN')
         provided_token = request.headers.get('X-Setup-Token') or request.json.get('setup_token') if request.is_json else None
         
-        if setup_token and provided_token != setup_token:
+        if setup_token and not secrets_match(provided_token, setup_token):
             return jsonify({'error': 'Invalid setup token'}), 401
         
         # Get validated data from schema
@@ -1614,8 +1997,8 @@ def setup_admin_user():
         first_name = data.get('first_name', 'Admin')
         last_name = data.get('last_name', 'User')
         
-        # Check if user exists
-        user = User.query.filter_by(email=email).first()
+        # Check if user exists (case-insensitive, same lookup as login)
+        user = User.query.filter(db.func.lower(User.email) == email).first()
         
         if user:
             # Update existing user
@@ -4,7 +4,7 @@ All fetchers should inherit from OpportunityFetcher.
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 
 class OpportunityFetcher(ABC):
     """Base class for all opportunity fetchers"""
@@ -25,6 +25,14 @@ class OpportunityFetcher(ABC):
         """
         pass
     
+    def iter_fetch(self) -> Iterator[Dict]:
+        """
+        Yield opportunities one at a time so callers can save them while the
+        rest are still being parsed. Fetchers that can stream override this;
+        the default just iterates over fetch().
+        """
+        return iter(self.fetch())
+    
     def normalize(self, raw_opportunity: Dict) -> Dict:
         """
         Normalize raw opportunity data to standard format.
@@ -215,6 +215,9 @@ def fetch_all_opportunities() -> Dict:
     except: pass
     # #endregion
     
+    # source -> {source_id: opportunity ID}, loaded once per source for duplicate checks
+    source_indexes = {}
+    
     # Fetch from each source
     for fetcher in fetchers:
         source_name = fetcher.source_name
@@ -236,8 +239,8 @@ def fetch_all_opportunities() -> Dict:
             except: pass
             # #endregion
             
-            # Fetch opportunities
-            opportunities = fetcher.fetch()
+            # Stream opportunities so each one is saved while the rest are still parsing
+            opportunities = fetcher.iter_fetch()
             
             # #region agent log
             try:
@@ -247,8 +250,8 @@ def fetch_all_opportunities() -> Dict:
                         'runId': 'run1',
                         'hypothesisId': 'B',
                         'location': 'scheduler.py:137',
-                        'message': 'After fetcher.fetch()',
-                        'data': {'source_name': source_name, 'opportunities_count': len(opportunities), 'error_count': fetcher.error_count},
+                        'message': 'After fetcher.iter_fetch()',
+                        'data': {'source_name': source_name, 'fetcher_type': type(fetcher).__name__},
                         'timestamp': int(datetime.utcnow().timestamp() * 1000)
                     }) + '\n')
             except: pass
@@ -257,9 +260,11 @@ def fetch_all_opportunities() -> Dict:
             # Save to database
             new_count = 0
             updated_count = 0
-            error_count = fetcher.error_count
+            error_count = 0
+            fetched_count = 0
             
             for idx, opp_dict in enumerate(opportunities):
+                fetched_count += 1
                 try:
                     # Central AI gate: only save if Ollama (or fallback) says it's a real opportunity
                     if not should_save_opportunity(opp_dict):
@@ -279,7 +284,7 @@ def fetch_all_opportunities() -> Dict:
                     except: pass
                     # #endregion
                     
-                    opportunity, is_new = save_or_update_opportunity(opp_dict)
+                    opportunity, is_new = save_or_update_opportunity(opp_dict, source_indexes=source_indexes)
                     
                     # #region agent log
                     try:
@@ -337,8 +342,10 @@ def fetch_all_opportunities() -> Dict:
                     error_count += 1
                     continue
             
+            # Fetch errors are only known once the stream is exhausted
+            error_count += fetcher.error_count
+            
             # Log results
-            fetched_count = len(opportunities)
             fetch_logger.log(
                 source=source_name,
                 fetched=fetched_count,
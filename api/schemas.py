@@ -5,6 +5,24 @@ Provides consistent validation and error messages across all API endpoints.
 from marshmallow import Schema, fields, validate, ValidationError, validates
 import re
 
+# Only addresses in this domain may register (admins are exempt at login)
+WVSU_EMAIL_SUFFIX = '@wvstateu.edu'
+
+# Password complexity rules, compiled once and checked in this order
+PASSWORD_RULES = (
+    (re.compile(r'[A-Z]').search, 'Password must contain at least one uppercase letter'),
+    (re.compile(r'[a-z]').search, 'Password must contain at least one lowercase letter'),
+    (re.compile(r'\d').search, 'Password must contain at least one digit'),
+)
+
+
+def password_strength_error(value):
+    """Return the first complexity rule the password fails, or None"""
+    for has_match, message in PASSWORD_RULES:
+        if not has_match(value):
+            return message
+    return None
+
 
 class RegisterSchema(Schema):
     """Schema for user registration"""
@@ -16,17 +34,14 @@ class RegisterSchema(Schema):
     @validates('password')
     def validate_password_strength(self, value):
         """Validate password meets complexity requirements"""
-        if not re.search(r'[A-Z]', value):
-            raise ValidationError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', value):
-            raise ValidationError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', value):
-            raise ValidationError('Password must contain at least one digit')
+        error = password_strength_error(value)
+        if error:
+            raise ValidationError(error)
     
     @validates('email')
     def validate_wvsu_email(self, value):
         """Validate email is from WVSU domain (unless admin)"""
-        if not value.lower().endswith('@wvstateu.edu'):
+        if value[-len(WVSU_EMAIL_SUFFIX):].lower() != WVSU_EMAIL_SUFFIX:
             raise ValidationError('Only WVSU email addresses (@wvstateu.edu) are allowed')
 
 
@@ -62,7 +77,7 @@ class OpportunityUpdateSchema(Schema):
     salary = fields.Str(allow_none=True, validate=validate.Length(max=50))
     application_url = fields.URL(allow_none=True, error_messages={'invalid': 'Invalid URL format'})
     deadline = fields.Date(allow_none=True)
-    is_deleted = fields.Bool(allow_none=True)
+    is_deleted = fields.Bool()  # column is NOT NULL
 
 
 class UserProfileUpdateSchema(Schema):
@@ -88,12 +103,9 @@ class SetupAdminSchema(Schema):
     @validates('password')
     def validate_password_strength(self, value):
         """Validate password meets complexity requirements"""
-        if not re.search(r'[A-Z]', value):
-            raise ValidationError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', value):
-            raise ValidationError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', value):
-            raise ValidationError('Password must contain at least one digit')
+        error = password_strength_error(value)
+        if error:
+            raise ValidationError(error)
 
 
 class OpportunityQuerySchema(Schema):
@@ -103,6 +115,8 @@ class OpportunityQuerySchema(Schema):
     search = fields.Str(validate=validate.Length(max=200))
     page = fields.Int(validate=validate.Range(min=1), missing=1)
     per_page = fields.Int(validate=validate.Range(min=1, max=100), missing=50)
+    cursor = fields.Str(validate=validate.Length(max=100))
+    include_total = fields.Bool(missing=False)
 
 
 class AIAdviceRequestSchema(Schema):
@@ -11,7 +11,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
 
 from index import app, db, User
-from werkzeug.security import check_password_hash
 from sqlalchemy import text
 
 def check_user(email):
@@ -63,9 +62,8 @@ def check_user(email):
                     
                     # Test password
                     if pwd_hash:
-                        from werkzeug.security import check_password_hash
                         test_password = 'admin123'
-                        pwd_check = check_password_hash(pwd_hash, test_password)
+                        pwd_check = User(password_hash=pwd_hash).check_password(test_password)
                         print(f"  Password check ('{test_password}'): {pwd_check}")
                     
                     return True
@@ -31,15 +31,20 @@ def main():
     with app.app_context():
         from api.ai_filter import classify_opportunity
 
-        # Load active opportunities
-        query = Opportunity.active_query().order_by(Opportunity.id.asc())
+        # Active opportunities as plain rows: only the columns the classifier reads,
+        # with the description cut to 500 chars by the database
+        query = Opportunity.active_query().with_entities(
+            Opportunity.id,
+            Opportunity.title,
+            db.func.substr(Opportunity.description, 1, 500).label('description'),
+            Opportunity.source
+        ).order_by(Opportunity.id.asc())
         if args.source:
             query = query.filter(Opportunity.source.ilike(f'%{args.source}%'))
         if args.limit:
             query = query.limit(args.limit)
 
-        opportunities = query.all()
-        total = len(opportunities)
+        total = query.count()
 
         print("=" * 60)
         print("Cleanup: Remove non-opportunities (AI classification)")
@@ -57,9 +62,10 @@ def main():
 
         to_delete = []
         errors = 0
-        for i, opp in enumerate(opportunities, 1):
+        # Stream in batches instead of holding the whole table in memory
+        for i, opp in enumerate(query.yield_per(500), 1):
             title = opp.title or ''
-            description = (opp.description or '')[:500]
+            description = opp.description or ''
             source = opp.source or 'unknown'
             try:
                 result = classify_opportunity(title, description, source)
@@ -98,9 +104,10 @@ def main():
             print("\nRun without --dry-run to apply.")
             return 0
 
-        # Soft-delete
-        for opp, _ in to_delete:
-            opp.is_deleted = True
+        # Soft-delete in one UPDATE
+        Opportunity.query.filter(Opportunity.id.in_([opp.id for opp, _ in to_delete])).update(
+            {Opportunity.is_deleted: True}, synchronize_session=False
+        )
         db.session.commit()
         print(f"\nSoft-deleted {len(to_delete)} opportunities.")
 
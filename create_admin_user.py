@@ -10,15 +10,14 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
 
-from index import app, db
-from werkzeug.security import generate_password_hash
+from index import app, db, password_hasher
 from sqlalchemy import text
 
 def create_or_update_admin_user(email, password, first_name, last_name):
     """Create admin user or update password if exists"""
     with app.app_context():
         email_lower = email.lower().strip()
-        password_hash = generate_password_hash(password)
+        password_hash = password_hasher.hash(password)
         
         try:
             # Check if user exists
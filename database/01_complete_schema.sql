@@ -85,7 +85,7 @@ CREATE TABLE public.opportunities (
     application_url VARCHAR(500),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    is_deleted BOOLEAN DEFAULT FALSE
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE
 );
 
 -- ============================================
@@ -106,20 +106,38 @@ CREATE TABLE public.opportunities (
 -- Users table indexes
 CREATE INDEX idx_users_email ON public.users(email);
 CREATE INDEX idx_users_created_at ON public.users(created_at);
+-- Login matches lower(email) so legacy mixed-case addresses still sign in;
+-- unique so the same address can't register twice in different cases
+CREATE UNIQUE INDEX idx_users_email_lower ON public.users(lower(email));
 CREATE INDEX idx_users_is_admin ON public.users(is_admin);
 
 -- Opportunities table indexes
 CREATE INDEX idx_opportunities_title ON public.opportunities(title);
-CREATE INDEX idx_opportunities_type ON public.opportunities(type);
-CREATE INDEX idx_opportunities_category ON public.opportunities(category);
 CREATE INDEX idx_opportunities_deadline ON public.opportunities(deadline);
 CREATE INDEX idx_opportunities_created_at ON public.opportunities(created_at);
 CREATE INDEX idx_opportunities_is_deleted ON public.opportunities(is_deleted);
 
--- Composite index for common query pattern
--- This helps when filtering by: is_deleted AND type AND category
+-- Partial index for common query pattern: only active rows are indexed
+-- This helps when filtering by: is_deleted = FALSE AND type AND category
 -- Example: "Get all active internships in Technology"
-CREATE INDEX idx_opp_active ON public.opportunities(is_deleted, type, category);
+CREATE INDEX idx_opp_active ON public.opportunities(type, category) WHERE is_deleted = FALSE;
+-- Distinct active categories for the filter dropdown (idx_opp_active covers types)
+CREATE INDEX idx_opp_category_active ON public.opportunities(category) WHERE is_deleted = FALSE;
+
+-- Composite index for the opportunities list: filter by type/category, newest first
+-- Lets the database satisfy both the WHERE and the ORDER BY from one index
+-- (type and category get no single-column indexes; these lead with them)
+CREATE INDEX idx_opp_type_cat_created ON public.opportunities(type, category, created_at DESC NULLS LAST) WHERE is_deleted = FALSE;
+-- Same for requests that filter on only one of type or category
+CREATE INDEX idx_opp_type_created ON public.opportunities(type, created_at DESC NULLS LAST) WHERE is_deleted = FALSE;
+CREATE INDEX idx_opp_category_created ON public.opportunities(category, created_at DESC NULLS LAST) WHERE is_deleted = FALSE;
+-- Unfiltered list and cursor pages: ORDER BY created_at DESC, id DESC straight off the index
+CREATE INDEX idx_opp_created_id ON public.opportunities(created_at DESC NULLS LAST, id DESC) WHERE is_deleted = FALSE;
+
+-- Full-text search index for the search box (title, company, description)
+-- Must match OPPORTUNITY_SEARCH_DOCUMENT in api/index.py
+CREATE INDEX idx_opportunities_search ON public.opportunities
+USING GIN (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || coalesce(description, '')));
 
 -- ============================================
 -- STEP 5: Create Function to Auto-Update Timestamps
@@ -0,0 +1,25 @@
+-- ============================================
+-- Migration: Full-text search index on opportunities
+-- ============================================
+-- /api/opportunities?search=... matches title, company and description.
+-- With LIKE '%q%' every search scanned the whole table; this GIN index
+-- lets PostgreSQL answer the search from an inverted index instead.
+--
+-- The indexed expression MUST stay identical to OPPORTUNITY_SEARCH_DOCUMENT
+-- in api/index.py, otherwise the planner will not use the index.
+--
+-- SAFE TO RUN: This will not delete any data
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_search
+ON public.opportunities
+USING GIN (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || coalesce(description, '')));
+
+-- ============================================
+-- Verification Query
+-- ============================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public'
+AND tablename = 'opportunities'
+AND indexname = 'idx_opportunities_search';
@@ -0,0 +1,59 @@
+-- ============================================
+-- Migration: Indexes for the opportunities list and login lookups
+-- ============================================
+-- /api/opportunities filters by type and/or category and always orders
+-- by created_at DESC NULLS LAST. Without a matching index PostgreSQL has
+-- to scan and sort; with it, the filter and the ORDER BY come from one
+-- index. NULLS LAST keeps rows without a timestamp at the end of the list,
+-- where the keyset cursor can page through them.
+--
+-- Every list query filters on is_deleted = FALSE, so the list indexes
+-- are partial and skip deleted rows.
+--
+-- SAFE TO RUN: This will not delete any data
+-- ============================================
+
+DROP INDEX IF EXISTS public.idx_opp_type_cat_created;
+CREATE INDEX idx_opp_type_cat_created
+ON public.opportunities(type, category, created_at DESC NULLS LAST)
+WHERE is_deleted = FALSE;
+
+-- A type-only or category-only filter can't use the index above for the
+-- ORDER BY (the other column sits in between), so give each its own
+DROP INDEX IF EXISTS public.idx_opp_type_created;
+CREATE INDEX idx_opp_type_created
+ON public.opportunities(type, created_at DESC NULLS LAST)
+WHERE is_deleted = FALSE;
+
+DROP INDEX IF EXISTS public.idx_opp_category_created;
+CREATE INDEX idx_opp_category_created
+ON public.opportunities(category, created_at DESC NULLS LAST)
+WHERE is_deleted = FALSE;
+
+-- The indexes above lead with type and category, so the single-column
+-- indexes on them add write cost on every insert without serving any
+-- query. idx_* come from 01_complete_schema.sql, ix_* from the app's
+-- db.create_all().
+DROP INDEX IF EXISTS public.idx_opportunities_type;
+DROP INDEX IF EXISTS public.idx_opportunities_category;
+DROP INDEX IF EXISTS public.ix_opportunities_type;
+DROP INDEX IF EXISTS public.ix_opportunities_category;
+
+-- With no type/category filter the list is just the newest active rows.
+-- Including id matches the ORDER BY created_at DESC, id DESC tiebreak, so
+-- a page (or a keyset cursor seek) is a short index walk with no sort
+CREATE INDEX IF NOT EXISTS idx_opp_created_id
+ON public.opportunities(created_at DESC NULLS LAST, id DESC);
+
+-- Login looks users up with lower(email) = :email (case-insensitive,
+-- without ILIKE's sequential scan)
+CREATE INDEX IF NOT EXISTS idx_users_email_lower
+ON public.users(lower(email));
+
+-- ============================================
+-- Verification Query
+-- ============================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public'
+AND indexname IN ('idx_opp_type_cat_created', 'idx_opp_type_created', 'idx_opp_category_created', 'idx_opp_created_id', 'idx_users_email_lower');
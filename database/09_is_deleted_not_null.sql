@@ -0,0 +1,43 @@
+-- ============================================
+-- Migration: Make is_deleted NOT NULL and index only active opportunities
+-- ============================================
+-- is_deleted used to allow NULL, so "active" had to be written as
+-- (is_deleted = FALSE OR is_deleted IS NULL). The OR kept PostgreSQL
+-- from matching that filter against a partial index. With NULLs
+-- backfilled and the column NOT NULL, the app filters on
+-- is_deleted = FALSE alone, and the list indexes can skip deleted rows.
+--
+-- SAFE TO RUN: This will not delete any data
+-- ============================================
+
+-- Backfill, then lock the column down
+UPDATE public.opportunities SET is_deleted = FALSE WHERE is_deleted IS NULL;
+
+ALTER TABLE public.opportunities ALTER COLUMN is_deleted SET DEFAULT FALSE;
+ALTER TABLE public.opportunities ALTER COLUMN is_deleted SET NOT NULL;
+
+-- Rebuild idx_opp_active as a partial index on active rows
+DROP INDEX IF EXISTS public.idx_opp_active;
+CREATE INDEX idx_opp_active
+ON public.opportunities(type, category)
+WHERE is_deleted = FALSE;
+
+-- Same for the unfiltered list order (created in 08_add_query_indexes.sql)
+DROP INDEX IF EXISTS public.idx_opp_created_id;
+CREATE INDEX idx_opp_created_id
+ON public.opportunities(created_at DESC NULLS LAST, id DESC)
+WHERE is_deleted = FALSE;
+
+-- ============================================
+-- Verification Query
+-- ============================================
+SELECT column_name, is_nullable, column_default
+FROM information_schema.columns
+WHERE table_schema = 'public'
+AND table_name = 'opportunities'
+AND column_name = 'is_deleted';
+
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public'
+AND indexname IN ('idx_opp_active', 'idx_opp_created_id');
@@ -0,0 +1,28 @@
+-- ============================================
+-- Migration: Partial index for the active categories facet
+-- ============================================
+-- /api/opportunities/types and /api/opportunities/categories walk the
+-- distinct values of one column over active rows (is_deleted = FALSE),
+-- one index probe per value. Types use idx_opp_active (type, category),
+-- which only indexes active rows. Categories had only the full
+-- idx_opportunities_category, so every probe also had to visit the heap
+-- to skip deleted rows. This index gives categories the same
+-- active-only path.
+--
+-- Requires 09_is_deleted_not_null.sql (the predicate must be exactly
+-- is_deleted = FALSE for the planner to match it).
+--
+-- SAFE TO RUN: This will not delete any data
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_opp_category_active
+ON public.opportunities(category)
+WHERE is_deleted = FALSE;
+
+-- ============================================
+-- Verification Query
+-- ============================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public'
+AND indexname = 'idx_opp_category_active';
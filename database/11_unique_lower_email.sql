@@ -0,0 +1,33 @@
+-- ============================================
+-- Migration: Make emails unique regardless of case
+-- ============================================
+-- Registration lowercases emails, and login and the admin scripts match
+-- on lower(email). The UNIQUE constraint on email is case-sensitive,
+-- though, so 'Foo@wvstateu.edu' and 'foo@wvstateu.edu' could both
+-- exist. This replaces idx_users_email_lower (08_add_query_indexes.sql)
+-- with a UNIQUE index on the same expression; the app returns 409
+-- "Email already registered" when it is violated.
+--
+-- Run the first query before the migration. If it returns rows, merge
+-- or rename those accounts first, or CREATE UNIQUE INDEX will fail.
+--
+-- SAFE TO RUN: This will not delete any data
+-- ============================================
+
+-- Accounts that differ only by case (must be empty)
+SELECT lower(email) AS email, count(*) AS accounts
+FROM public.users
+GROUP BY lower(email)
+HAVING count(*) > 1;
+
+DROP INDEX IF EXISTS public.idx_users_email_lower;
+CREATE UNIQUE INDEX idx_users_email_lower
+ON public.users(lower(email));
+
+-- ============================================
+-- Verification Query
+-- ============================================
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public'
+AND indexname = 'idx_users_email_lower';
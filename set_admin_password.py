@@ -10,15 +10,14 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
 
-from index import app, db
-from werkzeug.security import generate_password_hash
+from index import app, db, password_hasher
 from sqlalchemy import text
 
 def set_admin_password(email, password):
     """Set password for a user using raw SQL to avoid model column issues"""
     with app.app_context():
         email_lower = email.lower().strip()
-        password_hash = generate_password_hash(password)
+        password_hash = password_hasher.hash(password)
         
         # First check if user exists
         try:
@@ -88,9 +88,7 @@ def test_fetch():
                           f"{stats.get('new', 0)} new, {stats.get('updated', 0)} updated")
             
             # Check final count
-            final_count = Opportunity.query.filter(
-                (Opportunity.is_deleted == False) | (Opportunity.is_deleted.is_(None))
-            ).count()
+            final_count = Opportunity.active_query().count()
             print(f"\n   ✓ Total opportunities in database: {final_count}")
             
             print("\n" + "=" * 60)
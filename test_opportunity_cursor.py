@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script to verify keyset cursors page through every opportunity,
+including legacy rows without a created_at timestamp
+"""
+import sys
+import os
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
+
+from index import app, db, Opportunity
+
+CATEGORY = 'CursorTest'
+
+def test_cursor_round_trip():
+    """Following next_cursor from the first page visits every row exactly once"""
+    with app.app_context():
+        db.create_all()
+        opportunities = [
+            Opportunity(title=f'Cursor {i}', company='C', location='L', type='job',
+                        category=CATEGORY, description='cursor test row')
+            for i in range(5)
+        ]
+        db.session.add_all(opportunities)
+        db.session.commit()
+        expected = sorted((opp.id for opp in opportunities), reverse=True)
+        # Two legacy rows without a timestamp
+        Opportunity.query.filter(Opportunity.id.in_(expected[:2])).update(
+            {Opportunity.created_at: None}, synchronize_session=False
+        )
+        db.session.commit()
+    
+    try:
+        client = app.test_client()
+        seen = []
+        params = {'category': CATEGORY, 'per_page': 2}
+        response = client.get('/api/opportunities', query_string=params)
+        while True:
+            assert response.status_code == 200, response.get_json()
+            data = response.get_json()
+            seen.extend(opp['id'] for opp in data['opportunities'])
+            cursor = data['pagination']['next_cursor']
+            if not cursor:
+                break
+            response = client.get('/api/opportunities', query_string=dict(params, cursor=cursor))
+        
+        # Dated rows newest first, then the undated ones
+        assert seen == expected[2:] + expected[:2], seen
+        print(f"✓ Cursor pages returned all {len(seen)} rows in order")
+        return True
+    finally:
+        with app.app_context():
+            Opportunity.query.filter(Opportunity.category == CATEGORY).delete(synchronize_session=False)
+            db.session.commit()
+
+if __name__ == '__main__':
+    success = test_cursor_round_trip()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Test script to verify session values survive the cookie round-trip
+"""
+import sys
+import os
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
+
+from flask.sessions import SecureCookieSessionInterface
+from index import app
+
+def test_session_round_trip():
+    """Tagged session values (tuples, bytes) decode back to the same types"""
+    value = {'pair': (1, 2), 'raw': b'x', 'user_id': 7}
+    # Flask's cookie serializer decodes tagged values through app.json.loads
+    serializer = SecureCookieSessionInterface().get_signing_serializer(app)
+    with app.app_context():
+        decoded = serializer.loads(serializer.dumps(value))
+    assert decoded == value, decoded
+    assert isinstance(decoded['pair'], tuple)
+    assert isinstance(decoded['raw'], bytes)
+    print("✓ Session values round-trip unchanged")
+    return True
+
+if __name__ == '__main__':
+    success = test_session_round_trip()
+    sys.exit(0 if success else 1)
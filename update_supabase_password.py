@@ -12,21 +12,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 os.chdir(os.path.join(os.path.dirname(__file__), 'api'))
 
 from index import app, db, User
-from werkzeug.security import generate_password_hash
 
 def update_password(email, password):
     """Update password for a user in Supabase"""
     with app.app_context():
         email_lower = email.lower().strip()
-        password_hash = generate_password_hash(password)
         
         try:
-            # Check if user exists (case-insensitive for PostgreSQL)
-            is_postgres = 'postgresql' in str(db.engine.url) or 'postgres' in str(db.engine.url)
-            if is_postgres:
-                user = User.query.filter(User.email.ilike(email_lower)).first()
-            else:
-                user = User.query.filter_by(email=email_lower).first()
+            # Check if user exists (case-insensitive, same lookup as login)
+            user = User.query.filter(db.func.lower(User.email) == email_lower).first()
             
             if not user:
                 print(f"✗ User with email {email} not found in database")